@@ -1,17 +1,48 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import html
 import logging
+import multiprocessing
+import os
+import re
 
-from .crawler import WebCrawler
+from cachetools import TTLCache
+from playwright.async_api import async_playwright
+
+from .crawler import WebCrawler, launch_browser
 from .parser import web_parser
-from .markdown import markdown_converter
-from .config import config_manager
+from .worker import parse_page
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 网页标题位于<head>中，只需在文档开头查找
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+_TITLE_SEARCH_LIMIT = 8192
+
+def _create_cpu_pool() -> ProcessPoolExecutor:
+    """
+    创建执行HTML解析和Markdown转换的进程池
+    
+    Returns:
+        进程池实例
+    """
+    # 未配置PARSE_WORKERS时使用当前进程可用的CPU核数，容器通过cpuset限制CPU时以实际可用核数为准
+    if hasattr(os, "sched_getaffinity"):
+        default_workers = len(os.sched_getaffinity(0))
+    else:
+        default_workers = os.cpu_count() or 1
+    # 主进程中已有浏览器和线程，使用spawn方式创建工作进程更安全
+    return ProcessPoolExecutor(
+        max_workers=int(os.getenv("PARSE_WORKERS", str(default_workers))),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
 # 创建FastAPI应用
 app = FastAPI(
     title="Web Crawler API",
@@ -21,6 +52,129 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+@app.on_event("startup")
+async def startup():
+    """
+    应用启动时启动Playwright和共享浏览器，所有请求复用同一个浏览器实例
+    """
+    app.state.playwright = await async_playwright().start()
+    app.state.browser = await launch_browser(app.state.playwright, headless=True)
+    # 浏览器崩溃或断开连接后由第一个发现的请求负责重启，其余请求等待
+    app.state.browser_lock = asyncio.Lock()
+    # 限制同时打开的页面数量，避免并发过高时拖垮浏览器
+    app.state.page_sem = asyncio.BoundedSemaphore(int(os.getenv("PAGE_CONCURRENCY", "6")))
+    # 短时缓存抓取到的HTML，同一URL的重复请求或先后调用两个接口时无需再次打开页面
+    app.state.html_cache = TTLCache(
+        maxsize=int(os.getenv("HTML_CACHE_SIZE", "256")),
+        ttl=int(os.getenv("HTML_CACHE_TTL", "60"))
+    )
+    # HTML解析和Markdown转换是CPU密集型任务，放到进程池中执行，避免受GIL限制
+    app.state.cpu_pool = _create_cpu_pool()
+    # 工作进程异常退出后由第一个发现的请求负责重建进程池
+    app.state.cpu_pool_lock = asyncio.Lock()
+    logger.info("Shared browser launched")
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    应用关闭时关闭共享浏览器和Playwright
+    """
+    # 不等待进程池中的任务，避免阻塞事件循环
+    app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
+    await app.state.browser.close()
+    await app.state.playwright.stop()
+    logger.info("Shared browser closed")
+
+async def get_browser():
+    """
+    获取共享浏览器，浏览器崩溃或断开连接时重新启动
+    
+    Returns:
+        可用的浏览器实例
+    """
+    if app.state.browser.is_connected():
+        return app.state.browser
+    
+    async with app.state.browser_lock:
+        # 等待锁期间浏览器可能已被其他请求重启
+        if not app.state.browser.is_connected():
+            logger.warning("Shared browser disconnected, relaunching")
+            app.state.browser = await launch_browser(app.state.playwright, headless=True)
+            logger.info("Shared browser relaunched")
+    return app.state.browser
+
+async def _rebuild_cpu_pool(broken_pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """
+    重建已损坏的进程池
+    
+    Args:
+        broken_pool: 已损坏的进程池
+        
+    Returns:
+        可用的进程池实例
+    """
+    async with app.state.cpu_pool_lock:
+        # 进程池可能已被其他请求重建
+        if app.state.cpu_pool is broken_pool:
+            logger.warning("Process pool broken, rebuilding")
+            broken_pool.shutdown(wait=False, cancel_futures=True)
+            app.state.cpu_pool = _create_cpu_pool()
+    return app.state.cpu_pool
+
+async def run_cpu(fn: Callable, *args) -> Any:
+    """
+    在进程池中执行CPU密集型任务，工作进程异常退出（如内存不足被杀）导致进程池损坏时自动重建
+    
+    Args:
+        fn: 要执行的函数，需可被pickle
+        *args: 函数参数
+        
+    Returns:
+        函数的返回值
+    """
+    loop = asyncio.get_running_loop()
+    pool = app.state.cpu_pool
+    try:
+        future = loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # 进程池已被之前的任务损坏，重建后重新提交，本次请求不受影响
+        pool = await _rebuild_cpu_pool(pool)
+        future = loop.run_in_executor(pool, fn, *args)
+    
+    try:
+        return await future
+    except BrokenProcessPool:
+        # 执行期间工作进程退出，本次请求失败，重建进程池供后续请求使用
+        await _rebuild_cpu_pool(pool)
+        raise
+
+async def fetch_html(url: str, wait_until: str = "domcontentloaded", timeout: int = 60000) -> str:
+    """
+    获取网页HTML内容，优先使用缓存，未命中时使用共享浏览器抓取
+    
+    Args:
+        url: 目标URL
+        wait_until: 页面加载完成条件，默认为"domcontentloaded"
+        timeout: 页面加载超时时间（毫秒），默认为60秒
+        
+    Returns:
+        网页HTML内容
+    """
+    # 不同加载策略得到的内容可能不同，一并作为缓存键
+    cache_key = (url, wait_until)
+    html_content = app.state.html_cache.get(cache_key)
+    if html_content is not None:
+        logger.info(f"HTML cache hit for URL: {url}")
+        return html_content
+    
+    logger.info(f"Crawling URL: {url}")
+    browser = await get_browser()
+    async with WebCrawler(browser=browser, page_semaphore=app.state.page_sem) as crawler:
+        html_content = await crawler.get_page_content(url, wait_until=wait_until, timeout=timeout)
+    
+    app.state.html_cache[cache_key] = html_content
+    return html_content
+
 # 链接项模型
 class LinkItem(BaseModel):
     url: str
@@ -96,55 +250,38 @@ async def parse_web_page(request: ParseRequest):
     logger.info(f"Received parse request for URL: {url}, config: {config_name}")
     
     try:
-        # 获取配置
-        config = config_manager.get_config(config_name=config_name, url=url)
-        logger.info(f"Using config: {config}")
-        
-        # 使用异步爬虫获取网页内容
-        logger.info(f"Crawling URL: {url}")
-        async with WebCrawler(headless=True) as crawler:
-            # 使用更快的加载策略和更长的超时时间
-            html_content = await crawler.get_page_content(
-                url,
-                wait_until="domcontentloaded",
-                timeout=60000
-            )
-        
-        # 解析网页内容
-        logger.info("Parsing web content")
-        title, content_html = web_parser.parse(html_content, config)
+        # 获取网页内容，使用更快的加载策略和更长的超时时间
+        html_content = await fetch_html(url, wait_until="domcontentloaded", timeout=60000)
         
-        # 转换为Markdown
-        logger.info("Converting to Markdown")
-        markdown_content = markdown_converter.convert(content_html, title)
-        
-        # 提取所有链接
-        logger.info("Extracting links...")
-        links = web_parser.extract_links(html_content, url)
+        # 在进程池中解析网页内容、提取链接并转换为Markdown
+        logger.info("Parsing web content and converting to Markdown...")
+        title, markdown_content, links = await run_cpu(parse_page, html_content, url, config_name)
         
         # 返回成功响应
         logger.info(f"Successfully parsed URL: {url}, extracted {len(links)} links")
-        return ParseResponse(
-            success=True,
-            title=title,
-            content=markdown_content,
-            url=url,
-            links=links
-        )
+        # 直接返回字典，由FastAPI按response_model校验并序列化一次，避免先构建模型再重复校验
+        return {
+            "success": True,
+            "title": title,
+            "content": markdown_content,
+            "url": url,
+            "links": links,
+            "error": None
+        }
     
     except Exception as e:
         # 记录错误
         logger.error(f"Error parsing URL {url}: {str(e)}", exc_info=True)
         
         # 返回错误响应
-        return ParseResponse(
-            success=False,
-            title="",
-            content="",
-            url=url,
-            links=[],
-            error=str(e)
-        )
+        return {
+            "success": False,
+            "title": "",
+            "content": "",
+            "url": url,
+            "links": [],
+            "error": str(e)
+        }
 
 @app.post("/extract-links", response_model=ExtractLinksResponse, summary="Extract all links from web page")
 async def extract_links(request: ExtractLinksRequest):
@@ -162,51 +299,43 @@ async def extract_links(request: ExtractLinksRequest):
     logger.info(f"Received extract links request for URL: {url}")
     
     try:
-        # 使用异步爬虫获取网页内容
-        logger.info(f"Crawling URL: {url}")
-        async with WebCrawler(headless=True) as crawler:
-            # 使用更快的加载策略和更长的超时时间
-            html_content = await crawler.get_page_content(
-                url,
-                wait_until="domcontentloaded",
-                timeout=60000
-            )
-        
-        # 创建BeautifulSoup对象用于提取标题
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html_content, "html.parser")
+        # 获取网页内容，使用更快的加载策略和更长的超时时间
+        html_content = await fetch_html(url, wait_until="domcontentloaded", timeout=60000)
         
-        # 提取网页标题
-        title = ""
-        title_tag = soup.find("title")
-        if title_tag:
-            title = title_tag.get_text(strip=True)
+        # 提取网页标题，直接用正则在文档开头查找，无需完整解析HTML；
+        # 个别页面<head>中内联脚本过长，开头找不到时再搜索剩余部分
+        match = _TITLE_RE.search(html_content, 0, _TITLE_SEARCH_LIMIT)
+        if match is None:
+            match = _TITLE_RE.search(html_content)
+        title = html.unescape(match.group(1)).strip() if match else ""
         
-        # 提取所有链接
+        # 提取所有链接，放到进程池中执行，避免阻塞事件循环
         logger.info("Extracting links...")
-        links = web_parser.extract_links(html_content, url)
+        links = await run_cpu(web_parser.extract_links, html_content, url)
         
         # 返回成功响应
         logger.info(f"Successfully extracted {len(links)} links from URL: {url}")
-        return ExtractLinksResponse(
-            success=True,
-            title=title,
-            links=links,
-            url=url
-        )
+        # 直接返回字典，由FastAPI按response_model校验并序列化一次，避免先构建模型再重复校验
+        return {
+            "success": True,
+            "title": title,
+            "links": links,
+            "url": url,
+            "error": None
+        }
     
     except Exception as e:
         # 记录错误
         logger.error(f"Error extracting links from URL {url}: {str(e)}", exc_info=True)
         
         # 返回错误响应
-        return ExtractLinksResponse(
-            success=False,
-            title="",
-            links=[],
-            url=url,
-            error=str(e)
-        )
+        return {
+            "success": False,
+            "title": "",
+            "links": [],
+            "url": url,
+            "error": str(e)
+        }
 
 @app.get("/", summary="Health check")
 async def health_check():
@@ -1,6 +1,29 @@
 import os
+import functools
 import yaml
 from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from .parser import compile_selectors
+
+# 优先使用基于libyaml的C加载器，不可用时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# 域名到配置名称的映射
+_DOMAIN_MAPPING = {
+    "www.52pojie.cn": "52pojie",
+    "52pojie.cn": "52pojie",
+    "juejin.cn": "juejin",
+    "www.juejin.cn": "juejin",
+    "csdn.net": "csdn",
+    "www.csdn.net": "csdn",
+    "zhihu.com": "zhihu",
+    "www.zhihu.com": "zhihu",
+    "mp.weixin.qq.com": "wechat"
+}
 
 class ConfigManager:
     """
@@ -17,6 +40,8 @@ class ConfigManager:
         self.config_dir = config_dir
         self.configs: Dict[str, Dict[str, Any]] = {}
         self.default_config: Dict[str, Any] = {}
+        # 每个实例使用独立的配置查找缓存，按(config_name, domain)缓存查找结果
+        self._resolve = functools.lru_cache(maxsize=512)(self._resolve_uncached)
         
         # 加载所有配置文件
         self.load_configs()
@@ -37,15 +62,19 @@ class ConfigManager:
                 
                 # 加载配置文件
                 with open(config_path, "r", encoding="utf-8") as f:
-                    config = yaml.safe_load(f)
-                    self.configs[config_name] = config
+                    config = yaml.load(f, Loader=SafeLoader)
+                    # 预编译CSS选择器，避免每次请求重新编译
+                    self.configs[config_name] = compile_selectors(config)
         
         # 设置默认配置
-        self.default_config = self.configs.get("default", {
+        self.default_config = self.configs.get("default") or compile_selectors({
             "title_selector": "title",
             "content_selector": "body",
             "exclude_selectors": ["script", "style", "nav", "footer"]
         })
+        
+        # 配置已变化，清空配置查找缓存
+        self._resolve.cache_clear()
     
     def get_config(self, config_name: Optional[str] = None, url: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -55,6 +84,23 @@ class ConfigManager:
             config_name: 配置名称，如"default"、"wechat"
             url: 目标URL，用于根据域名自动匹配配置
             
+        Returns:
+            配置字典
+        """
+        domain = None
+        if url:
+            domain = urlparse(url).netloc
+        
+        return self._resolve(config_name, domain)
+    
+    def _resolve_uncached(self, config_name: Optional[str], domain: Optional[str]) -> Dict[str, Any]:
+        """
+        根据配置名称和域名查找配置，通过实例的_resolve调用时结果按参数缓存
+        
+        Args:
+            config_name: 配置名称
+            domain: 目标URL的域名
+            
         Returns:
             配置字典
         """
@@ -62,28 +108,11 @@ class ConfigManager:
         if config_name and config_name in self.configs:
             return self.configs[config_name]
         
-        # 如果提供了URL，尝试根据域名匹配配置
-        if url:
-            from urllib.parse import urlparse
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
-            
-            # 域名到配置名称的映射
-            domain_mapping = {
-            "www.52pojie.cn": "52pojie",
-            "52pojie.cn": "52pojie",
-            "juejin.cn": "juejin",
-            "www.juejin.cn": "juejin",
-            "csdn.net": "csdn",
-            "www.csdn.net": "csdn",
-            "zhihu.com": "zhihu",
-            "www.zhihu.com": "zhihu",
-            "mp.weixin.qq.com": "wechat"
-        }
-            
+        # 如果提供了域名，尝试根据域名匹配配置
+        if domain:
             # 检查域名映射
-            if domain in domain_mapping:
-                mapped_config_name = domain_mapping[domain]
+            if domain in _DOMAIN_MAPPING:
+                mapped_config_name = _DOMAIN_MAPPING[domain]
                 if mapped_config_name in self.configs:
                     return self.configs[mapped_config_name]
             
@@ -96,8 +125,8 @@ class ConfigManager:
             if len(parts) >= 2:
                 tld = ".".join(parts[-2:])
                 # 检查顶级域名映射
-                if tld in domain_mapping:
-                    mapped_config_name = domain_mapping[tld]
+                if tld in _DOMAIN_MAPPING:
+                    mapped_config_name = _DOMAIN_MAPPING[tld]
                     if mapped_config_name in self.configs:
                         return self.configs[mapped_config_name]
                 
@@ -1,64 +1,130 @@
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Route, TimeoutError as PlaywrightTimeoutError
 from typing import Optional, Dict, Any
+from contextlib import nullcontext
 import asyncio
 
+# Chromium启动参数
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-accelerated-2d-canvas",
+    "--no-first-run",
+    "--disable-gpu"
+]
+
+# 只需要页面HTML，这些类型的资源直接拦截，不发起请求
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+async def _block_resources(route: Route):
+    """
+    路由处理函数，拦截不影响HTML内容的资源请求
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def launch_browser(playwright, headless: bool = True) -> Browser:
+    """
+    使用统一的启动参数启动Chromium浏览器
+    
+    Args:
+        playwright: 已启动的Playwright实例
+        headless: 是否使用无头浏览器模式，默认为True
+        
+    Returns:
+        浏览器实例
+    """
+    return await playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+
 class WebCrawler:
     """
     网页爬虫引擎，使用Playwright进行网页请求和内容获取（异步版）
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, browser: Optional[Browser] = None, page_semaphore: Optional[asyncio.Semaphore] = None, block_resources: bool = True):
         """
         初始化爬虫引擎
         
         Args:
             headless: 是否使用无头浏览器模式，默认为True
+            browser: 外部共享的浏览器实例，可选。传入时仅为本次爬取创建和关闭上下文，
+                浏览器的生命周期由调用方管理
+            page_semaphore: 限制并发页面数量的信号量，可选。多个爬虫共享同一个信号量时，
+                同时打开的页面总数不超过其上限
+            block_resources: 是否拦截图片、媒体、字体和样式表请求，默认为True
         """
         self.headless = headless
         self.playwright = None
-        self.browser: Optional[Browser] = None
+        self.browser: Optional[Browser] = browser
         self.context: Optional[BrowserContext] = None
+        # 是否由当前爬虫自行启动和关闭浏览器
+        self._owns_browser = browser is None
+        self.page_semaphore = page_semaphore
+        self.block_resources = block_resources
     
     async def __aenter__(self):
         """
-        进入异步上下文管理器，初始化Playwright和浏览器
+        进入异步上下文管理器，初始化Playwright和浏览器（未传入共享浏览器时）并创建上下文
         """
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-accelerated-2d-canvas",
-                "--no-first-run",
-                "--no-zygote",
-                "--single-process",
-                "--disable-gpu"
-            ]
-        )
+        if self._owns_browser:
+            self.playwright = await async_playwright().start()
+            self.browser = await launch_browser(self.playwright, headless=self.headless)
         self.context = await self.browser.new_context()
+        if self.block_resources:
+            await self.context.route("**/*", _block_resources)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
-        退出异步上下文管理器，关闭浏览器和Playwright
+        退出异步上下文管理器，关闭上下文；自行启动的浏览器和Playwright一并关闭
         """
         if self.context:
             await self.context.close()
+            self.context = None
+        if not self._owns_browser:
+            return
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
     
-    async def get_page_content(self, url: str, wait_time: int = 5, wait_for_selector: Optional[str] = None, wait_until: str = "domcontentloaded", timeout: int = 60000) -> str:
+    def _page_slot(self):
+        """
+        获取一个页面并发名额，未设置信号量时不做限制
+        """
+        return self.page_semaphore if self.page_semaphore is not None else nullcontext()
+    
+    async def _wait_for_ready(self, page: Page, wait_time: int, wait_for_selector: Optional[str] = None) -> None:
+        """
+        等待页面就绪：指定了选择器时等待该元素出现，否则等待网络空闲（超时则直接继续）
+        
+        Args:
+            page: 已完成导航的页面
+            wait_time: 就绪后额外等待的时间（秒），为0时不等待
+            wait_for_selector: 等待特定元素出现的CSS选择器，可选
+        """
+        if wait_for_selector:
+            await page.wait_for_selector(wait_for_selector, timeout=10000)
+        else:
+            try:
+                await page.wait_for_load_state("networkidle", timeout=5000)
+            except PlaywrightTimeoutError:
+                # 长连接或轮询请求会使页面始终无法进入网络空闲，使用当前内容即可
+                pass
+        
+        if wait_time:
+            await page.wait_for_timeout(wait_time * 1000)
+    
+    async def get_page_content(self, url: str, wait_time: int = 0, wait_for_selector: Optional[str] = None, wait_until: str = "domcontentloaded", timeout: int = 60000) -> str:
         """
         获取网页内容
         
         Args:
             url: 目标URL
-            wait_time: 页面加载等待时间（秒），默认为5秒
-            wait_for_selector: 等待特定元素出现的CSS选择器，可选
+            wait_time: 页面就绪后额外等待的时间（秒），默认为0，不额外等待
+            wait_for_selector: 等待特定元素出现的CSS选择器，可选；未指定时等待网络空闲
             wait_until: 页面加载完成条件，默认为"domcontentloaded"
             timeout: 页面加载超时时间（毫秒），默认为60秒
             
@@ -68,32 +134,30 @@ class WebCrawler:
         if not self.context:
             raise RuntimeError("Browser context not initialized. Use async with statement.")
         
-        page: Page = await self.context.new_page()
-        
-        try:
-            # 导航到目标URL，使用更快的加载策略和更长的超时时间
-            await page.goto(url, wait_until=wait_until, timeout=timeout)
-            
-            # 等待指定时间，确保页面完全加载
-            await page.wait_for_timeout(wait_time * 1000)
-            
-            # 如果指定了选择器，等待该元素出现
-            if wait_for_selector:
-                await page.wait_for_selector(wait_for_selector, timeout=10000)
+        # 占用一个页面并发名额，页面关闭后释放
+        async with self._page_slot():
+            page: Page = await self.context.new_page()
             
-            # 获取页面HTML内容
-            content = await page.content()
-            return content
-        finally:
-            await page.close()
+            try:
+                # 导航到目标URL，使用更快的加载策略和更长的超时时间
+                await page.goto(url, wait_until=wait_until, timeout=timeout)
+                
+                # 等待页面就绪
+                await self._wait_for_ready(page, wait_time, wait_for_selector)
+                
+                # 获取页面HTML内容
+                content = await page.content()
+                return content
+            finally:
+                await page.close()
     
-    async def get_page_title(self, url: str, wait_time: int = 3, wait_until: str = "domcontentloaded", timeout: int = 60000) -> str:
+    async def get_page_title(self, url: str, wait_time: int = 0, wait_until: str = "domcontentloaded", timeout: int = 60000) -> str:
         """
         获取网页标题
         
         Args:
             url: 目标URL
-            wait_time: 页面加载等待时间（秒），默认为3秒
+            wait_time: 页面就绪后额外等待的时间（秒），默认为0，不额外等待
             wait_until: 页面加载完成条件，默认为"domcontentloaded"
             timeout: 页面加载超时时间（毫秒），默认为60秒
             
@@ -103,30 +167,32 @@ class WebCrawler:
         if not self.context:
             raise RuntimeError("Browser context not initialized. Use async with statement.")
         
-        page: Page = await self.context.new_page()
-        
-        try:
-            # 导航到目标URL，使用更快的加载策略和更长的超时时间
-            await page.goto(url, wait_until=wait_until, timeout=timeout)
-            
-            # 等待指定时间
-            await page.wait_for_timeout(wait_time * 1000)
+        # 占用一个页面并发名额，页面关闭后释放
+        async with self._page_slot():
+            page: Page = await self.context.new_page()
             
-            # 获取页面标题
-            title = await page.title()
-            return title
-        finally:
-            await page.close()
+            try:
+                # 导航到目标URL，使用更快的加载策略和更长的超时时间
+                await page.goto(url, wait_until=wait_until, timeout=timeout)
+                
+                # 等待页面就绪
+                await self._wait_for_ready(page, wait_time)
+                
+                # 获取页面标题
+                title = await page.title()
+                return title
+            finally:
+                await page.close()
 
 # 便捷函数：单次爬取网页内容
-async def crawl(url: str, headless: bool = True, wait_time: int = 5, wait_until: str = "domcontentloaded", timeout: int = 60000) -> str:
+async def crawl(url: str, headless: bool = True, wait_time: int = 0, wait_until: str = "domcontentloaded", timeout: int = 60000) -> str:
     """
     便捷函数，单次爬取网页内容
     
     Args:
         url: 目标URL
         headless: 是否使用无头浏览器模式
-        wait_time: 页面加载等待时间（秒）
+        wait_time: 页面就绪后额外等待的时间（秒），默认为0
         wait_until: 页面加载完成条件，默认为"domcontentloaded"
         timeout: 页面加载超时时间（毫秒），默认为60秒
         
@@ -1,5 +1,31 @@
+import re
 import markdownify
-from typing import Optional
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from typing import Optional, Union, Set, List
+
+# 预编译清理Markdown用的正则：行尾空白、连续空行
+_TRAILING_WS = re.compile(r"[^\S\n]+$", re.M)
+_MULTI_BLANK = re.compile(r"\n{3,}")
+
+# 文本空白规范化，与markdownify一致
+_NEWLINE_WS = re.compile(r"[\t \r\n]*[\r\n][\t \r\n]*")
+_INLINE_WS = re.compile(r"[\t ]+")
+_ALL_WS = re.compile(r"[\t \r\n]+")
+_LINE_WITH_CONTENT = re.compile(r"^(.*)", re.M)
+_BACKTICK_RUNS = re.compile(r"`+")
+_EXTRACT_NEWLINES = re.compile(r"^(\n*)((?:.*[^\n])?)(\n*)$", re.S)
+
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+# 块级标签，其内部边界及两侧的空白文本会被忽略
+_BLOCK_TAGS = _HEADING_TAGS | {
+    "p", "blockquote", "article", "div", "section", "ol", "ul", "li",
+    "dl", "dt", "dd", "table", "thead", "tbody", "tfoot", "tr", "td", "th"
+}
+
+# 遍历lxml元素时不直接处理、整体交给markdownify转换的标签
+_FALLBACK_TAGS = {"table", "thead", "tbody", "tfoot", "tr", "td", "th", "caption", "dl", "dt", "dd", "video"}
 
 class MarkdownConverter:
     """
@@ -20,19 +46,23 @@ class MarkdownConverter:
             "strong_em_symbol": "*",    # 粗体和斜体使用*符号
         }
     
-    def convert(self, html_content: str, title: Optional[str] = None) -> str:
+    def convert(self, html_content: Union[str, lxml_html.HtmlElement], title: Optional[str] = None) -> str:
         """
         将HTML内容转换为Markdown格式
         
         Args:
-            html_content: HTML内容
+            html_content: HTML内容，或已解析的lxml元素（直接遍历元素，无需再次解析HTML）
             title: 可选的标题，会添加到Markdown内容开头
             
         Returns:
             Markdown格式的内容
         """
-        # 使用markdownify转换HTML
-        md_content = markdownify.markdownify(html_content, **self.options)
+        if isinstance(html_content, str):
+            # 使用markdownify转换HTML
+            md_content = markdownify.markdownify(html_content, **self.options)
+        else:
+            # 直接遍历lxml元素，不支持的标签回退到markdownify
+            md_content = _ElementConverter(markdownify.MarkdownConverter(**self.options), html_content).convert()
         
         # 如果提供了标题，添加到内容开头
         if title:
@@ -57,28 +87,8 @@ class MarkdownConverter:
         Returns:
             清理后的Markdown内容
         """
-        lines = []
-        
-        # 遍历每一行，清理多余的空白和空行
-        for line in md_content.splitlines():
-            stripped_line = line.rstrip()
-            
-            # 只添加非空行，或者保留必要的空行
-            if stripped_line:
-                lines.append(stripped_line)
-            else:
-                # 避免连续的空行
-                if not lines or lines[-1]:
-                    lines.append("")
-        
-        # 移除末尾的空行
-        while lines and not lines[-1]:
-            lines.pop()
-        
-        # 重新组合内容
-        cleaned_content = "\n".join(lines)
-        
-        return cleaned_content
+        # 去除行尾空白，将连续空行合并为一个，并去除首尾空行
+        return _MULTI_BLANK.sub("\n\n", _TRAILING_WS.sub("", md_content)).strip("\n")
     
     def convert_title(self, title: str) -> str:
         """
@@ -95,5 +105,320 @@ class MarkdownConverter:
             return f"# {title}"
         return title
 
+class _ElementConverter:
+    """
+    直接遍历lxml元素生成Markdown，转换规则与markdownify保持一致
+    
+    表格、定义列表和视频等标签的子树序列化后交给markdownify转换
+    """
+    
+    def __init__(self, fallback: markdownify.MarkdownConverter, root: lxml_html.HtmlElement):
+        """
+        初始化元素转换器
+        
+        Args:
+            fallback: 提供转换选项并负责处理回退标签的markdownify转换器
+            root: 要转换的根元素
+        """
+        self.fallback = fallback
+        self.options = fallback.options
+        self.root = root
+    
+    def convert(self) -> str:
+        """
+        转换根元素，去除首尾空行
+        """
+        return self._process_tag(self.root, set()).strip("\n")
+    
+    def _process_tag(self, el: lxml_html.HtmlElement, parent_tags: Set[str]) -> str:
+        """
+        递归转换元素及其子节点
+        """
+        tag = el.tag
+        if tag in _FALLBACK_TAGS:
+            # 只为该子树构建BeautifulSoup对象，并传入上下文标签，保证转换结果与整体转换一致；
+            # 子树外层按祖先中ul的数量包裹同样层数的ul，使其中列表项的项目符号深度不变
+            ul_depth = 0
+            node = el
+            while node is not self.root:
+                node = node.getparent()
+                if node.tag == "ul":
+                    ul_depth += 1
+            markup = "<ul>" * ul_depth + lxml_html.tostring(el, encoding="unicode", with_tail=False) + "</ul>" * ul_depth
+            node = BeautifulSoup(markup, **self.options["bs4_options"])
+            for _ in range(ul_depth + 1):
+                node = node.contents[0]
+            return self.fallback.process_tag(node, parent_tags=set(parent_tags))
+        
+        # 子节点的上下文标签
+        child_tags = set(parent_tags)
+        child_tags.add(tag)
+        if tag in _HEADING_TAGS:
+            child_tags.add("_inline")
+        if tag in ("pre", "code", "kbd", "samp"):
+            child_tags.add("_noformat")
+        
+        # 按文档顺序排列子节点：文本节点为字符串，子元素为元素对象
+        children: List[Union[str, lxml_html.HtmlElement]] = [el.text] if el.text else []
+        for child in el:
+            if isinstance(child.tag, str):
+                children.append(child)
+            if child.tail:
+                children.append(child.tail)
+        
+        is_block = tag in _BLOCK_TAGS
+        child_strings = []
+        for index, node in enumerate(children):
+            if not isinstance(node, str):
+                child_strings.append(self._process_tag(node, child_tags))
+                continue
+            
+            prev_node = children[index - 1] if index > 0 else None
+            next_node = children[index + 1] if index + 1 < len(children) else None
+            # 忽略块级元素内部边界及两侧的空白文本
+            if not node.strip() and ((is_block and (prev_node is None or next_node is None))
+                                     or _is_block_outside(prev_node) or _is_block_outside(next_node)):
+                continue
+            child_strings.append(self._process_text(node, prev_node, next_node, is_block, child_tags))
+        
+        child_strings = [child_string for child_string in child_strings if child_string]
+        
+        # 合并相邻子节点边界处的换行，最多保留两个；pre内部保持原样
+        if tag != "pre" and "pre" not in parent_tags:
+            updated_child_strings = [""]
+            for child_string in child_strings:
+                leading_nl, content, trailing_nl = _EXTRACT_NEWLINES.match(child_string).groups()
+                if updated_child_strings[-1] and leading_nl:
+                    prev_trailing_nl = updated_child_strings.pop()
+                    leading_nl = "\n" * min(2, max(len(prev_trailing_nl), len(leading_nl)))
+                updated_child_strings.extend([leading_nl, content, trailing_nl])
+            child_strings = updated_child_strings
+        
+        text = "".join(child_strings)
+        
+        if tag in _HEADING_TAGS:
+            return self._convert_heading(int(tag[1]), text, parent_tags)
+        convert_fn = getattr(self, "_convert_%s" % tag, None)
+        if convert_fn is not None:
+            return convert_fn(el, text, parent_tags)
+        return text
+    
+    def _process_text(self, text: str, prev_node, next_node, parent_is_block: bool, parent_tags: Set[str]) -> str:
+        """
+        转换文本节点：规范化空白、转义特殊字符，并去除块级元素边界处的空白
+        """
+        if "pre" not in parent_tags:
+            text = _NEWLINE_WS.sub("\n", text)
+            text = _INLINE_WS.sub(" ", text)
+        
+        if "_noformat" not in parent_tags:
+            text = self.fallback.escape(text, parent_tags)
+        
+        if _is_block_outside(prev_node) or (parent_is_block and prev_node is None):
+            text = text.lstrip(" \t\r\n")
+        if _is_block_outside(next_node) or (parent_is_block and next_node is None):
+            text = text.rstrip()
+        
+        return text
+    
+    def _inline(self, markup: str, text: str, parent_tags: Set[str]) -> str:
+        """
+        用标记包裹行内文本，首尾空格移到标记外侧
+        """
+        if "_noformat" in parent_tags:
+            return text
+        prefix, suffix, text = markdownify.chomp(text)
+        if not text:
+            return ""
+        return "%s%s%s%s%s" % (prefix, markup, text, markup, suffix)
+    
+    def _convert_a(self, el, text, parent_tags):
+        if "_noformat" in parent_tags:
+            return text
+        prefix, suffix, text = markdownify.chomp(text)
+        if not text:
+            return ""
+        href = el.get("href")
+        title = el.get("title")
+        # 链接文本与地址相同时使用<url>简写
+        if self.options["autolinks"] and text.replace(r"\_", "_") == href and not title and not self.options["default_title"]:
+            return "<%s>" % href
+        if self.options["default_title"] and not title:
+            title = href
+        title_part = ' "%s"' % title.replace('"', r'\"') if title else ""
+        return "%s[%s](%s%s)%s" % (prefix, text, href, title_part, suffix) if href else text
+    
+    def _convert_b(self, el, text, parent_tags):
+        return self._inline(2 * self.options["strong_em_symbol"], text, parent_tags)
+    
+    _convert_strong = _convert_b
+    
+    def _convert_em(self, el, text, parent_tags):
+        return self._inline(self.options["strong_em_symbol"], text, parent_tags)
+    
+    _convert_i = _convert_em
+    
+    def _convert_del(self, el, text, parent_tags):
+        return self._inline("~~", text, parent_tags)
+    
+    _convert_s = _convert_del
+    
+    def _convert_sub(self, el, text, parent_tags):
+        return self._inline(self.options["sub_symbol"], text, parent_tags)
+    
+    def _convert_sup(self, el, text, parent_tags):
+        return self._inline(self.options["sup_symbol"], text, parent_tags)
+    
+    def _convert_code(self, el, text, parent_tags):
+        if "_noformat" in parent_tags:
+            return text
+        prefix, suffix, text = markdownify.chomp(text)
+        if not text:
+            return ""
+        # 分隔符比内容中最长的连续反引号多一个
+        max_backticks = max((len(run) for run in _BACKTICK_RUNS.findall(text)), default=0)
+        delimiter = "`" * (max_backticks + 1)
+        if max_backticks > 0:
+            text = " " + text + " "
+        return "%s%s%s%s%s" % (prefix, delimiter, text, delimiter, suffix)
+    
+    _convert_kbd = _convert_code
+    _convert_samp = _convert_code
+    
+    def _convert_blockquote(self, el, text, parent_tags):
+        text = (text or "").strip(" \t\r\n")
+        if "_inline" in parent_tags:
+            return " " + text + " "
+        if not text:
+            return "\n"
+        text = _LINE_WITH_CONTENT.sub(lambda match: "> " + match.group(1) if match.group(1) else ">", text)
+        return "\n" + text + "\n\n"
+    
+    def _convert_br(self, el, text, parent_tags):
+        if "_inline" in parent_tags:
+            return text + " " if text else " "
+        if self.options["newline_style"].lower() == markdownify.BACKSLASH:
+            return "\\\n" + text
+        return "  \n" + text
+    
+    def _convert_div(self, el, text, parent_tags):
+        if "_inline" in parent_tags:
+            return " " + text.strip() + " "
+        text = text.strip()
+        return "\n\n%s\n\n" % text if text else ""
+    
+    _convert_article = _convert_div
+    _convert_section = _convert_div
+    
+    def _convert_figcaption(self, el, text, parent_tags):
+        return "\n\n" + text.strip() + "\n\n"
+    
+    def _convert_heading(self, n: int, text: str, parent_tags: Set[str]) -> str:
+        if "_inline" in parent_tags:
+            return text
+        style = self.options["heading_style"].lower()
+        text = text.strip()
+        if style == markdownify.UNDERLINED and n <= 2:
+            return self.fallback.underline(text, "=" if n == 1 else "-")
+        text = _ALL_WS.sub(" ", text)
+        hashes = "#" * n
+        if style == markdownify.ATX_CLOSED:
+            return "\n\n%s %s %s\n\n" % (hashes, text, hashes)
+        return "\n\n%s %s\n\n" % (hashes, text)
+    
+    def _convert_hr(self, el, text, parent_tags):
+        return "\n\n---\n\n"
+    
+    def _convert_img(self, el, text, parent_tags):
+        alt = el.get("alt") or ""
+        src = el.get("src") or ""
+        title = el.get("title") or ""
+        title_part = ' "%s"' % title.replace('"', r'\"') if title else ""
+        parent = el.getparent() if el is not self.root else None
+        if "_inline" in parent_tags and (parent is None or parent.tag not in self.options["keep_inline_images_in"]):
+            return alt
+        return "![%s](%s%s)" % (alt, src, title_part)
+    
+    def _convert_ul(self, el, text, parent_tags):
+        # 列表后紧跟非列表内容时多保留一个换行
+        before_paragraph = False
+        if el is not self.root:
+            if el.tail and el.tail.strip():
+                before_paragraph = True
+            else:
+                next_sibling = el.getnext()
+                while next_sibling is not None and not isinstance(next_sibling.tag, str):
+                    next_sibling = next_sibling.getnext()
+                if next_sibling is not None and next_sibling.tag not in ("ul", "ol"):
+                    before_paragraph = True
+        if "li" in parent_tags:
+            # 嵌套列表去除末尾换行
+            return "\n" + text.rstrip()
+        return "\n\n" + text + ("\n" if before_paragraph else "")
+    
+    _convert_ol = _convert_ul
+    
+    def _convert_li(self, el, text, parent_tags):
+        text = (text or "").strip()
+        if not text:
+            return "\n"
+        
+        parent = el.getparent() if el is not self.root else None
+        if parent is not None and parent.tag == "ol":
+            start = parent.get("start")
+            start = int(start) if start and start.isnumeric() else 1
+            bullet = "%s." % (start + sum(1 for sibling in el.itersiblings(preceding=True) if sibling.tag == "li"))
+        else:
+            # 按所在ul的嵌套深度轮换项目符号
+            depth = -1
+            node = el
+            while node is not None:
+                if node.tag == "ul":
+                    depth += 1
+                node = node.getparent() if node is not self.root else None
+            bullets = self.options["bullets"]
+            bullet = bullets[depth % len(bullets)]
+        bullet = bullet + " "
+        bullet_indent = " " * len(bullet)
+        
+        # 后续行按项目符号宽度缩进
+        text = _LINE_WITH_CONTENT.sub(lambda match: bullet_indent + match.group(1) if match.group(1) else "", text)
+        text = bullet + text[len(bullet):]
+        return "%s\n" % text
+    
+    def _convert_p(self, el, text, parent_tags):
+        if "_inline" in parent_tags:
+            return " " + text.strip(" \t\r\n") + " "
+        text = text.strip(" \t\r\n")
+        return "\n\n%s\n\n" % text if text else ""
+    
+    def _convert_pre(self, el, text, parent_tags):
+        if not text:
+            return ""
+        code_language = self.options["code_language"]
+        if self.options["code_language_callback"]:
+            # 回调函数约定接收BeautifulSoup的Tag，将该pre元素序列化后转换为Tag再传入
+            soup = BeautifulSoup(lxml_html.tostring(el, encoding="unicode", with_tail=False), **self.options["bs4_options"])
+            code_language = self.options["code_language_callback"](soup.contents[0]) or code_language
+        if self.options["strip_pre"] == markdownify.STRIP:
+            text = markdownify.strip_pre(text)
+        elif self.options["strip_pre"] == markdownify.STRIP_ONE:
+            text = markdownify.strip1_pre(text)
+        return "\n\n```%s\n%s\n```\n\n" % (code_language, text)
+    
+    def _convert_q(self, el, text, parent_tags):
+        return '"' + text + '"'
+    
+    def _convert_script(self, el, text, parent_tags):
+        return ""
+    
+    _convert_style = _convert_script
+
+def _is_block_outside(node) -> bool:
+    """
+    判断相邻节点是否为两侧空白应被忽略的块级元素（含pre）
+    """
+    return node is not None and not isinstance(node, str) and (node.tag in _BLOCK_TAGS or node.tag == "pre")
+
 # 创建全局转换器实例
 markdown_converter = MarkdownConverter()
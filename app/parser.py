@@ -1,10 +1,113 @@
-from bs4 import BeautifulSoup, Tag
-from typing import Dict, Any, Optional, Tuple, List
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from typing import Dict, Any, Optional, Tuple, List, Iterable, Callable
 from urllib.parse import urljoin, urlparse
 
+# 链接提取优先使用selectolax(Lexbor)，未安装时回退到lxml
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# 预编译的固定CSS选择器，避免每次请求重新编译
+_META_TITLE = CSSSelector("meta[name='title']")
+_OG_TITLE = CSSSelector("meta[property='og:title']")
+_A_HREF = CSSSelector("a[href]")
+
+# 配置中未指定选择器时使用的默认值
+DEFAULT_TITLE_SELECTOR = "title"
+DEFAULT_CONTENT_SELECTOR = "body"
+DEFAULT_EXCLUDE_SELECTORS = ["script", "style", "nav", "footer"]
+
+def compile_selectors(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    预编译配置中的CSS选择器，结果以_title_sel、_content_sel、_exclude_sels键写回配置
+    
+    Args:
+        config: 解析配置，包含title_selector、content_selector、exclude_selectors等
+        
+    Returns:
+        写入编译结果后的同一个配置字典
+    """
+    config["_title_sel"] = CSSSelector(config.get("title_selector", DEFAULT_TITLE_SELECTOR))
+    config["_content_sel"] = CSSSelector(config.get("content_selector", DEFAULT_CONTENT_SELECTOR))
+    config["_exclude_sels"] = [CSSSelector(selector) for selector in config.get("exclude_selectors", DEFAULT_EXCLUDE_SELECTORS)]
+    return config
+
+# 元素内除脚本和样式以外的所有文本节点
+_VISIBLE_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+
+def _get_text(element: lxml_html.HtmlElement) -> str:
+    """
+    获取元素内的文本，跳过脚本和样式，逐段去除首尾空白后拼接（与BeautifulSoup的get_text(strip=True)一致）
+    """
+    return "".join(text.strip() for text in _VISIBLE_TEXT(element))
+
+def _collect_links(
+    anchors: Iterable[Any],
+    base_url: str,
+    get_attr: Callable[[Any, str], str],
+    get_text: Callable[[Any], str],
+    find_img: Callable[[Any], Any]
+) -> List[Dict[str, str]]:
+    """
+    从a标签序列中收集链接，跳过无效和重复的URL并按优先级确定标题；
+    不同解析器的节点通过传入的访问函数读取属性、文本和img子元素
+    
+    Args:
+        anchors: a标签节点序列
+        base_url: 基础URL，用于处理相对URL
+        get_attr: 读取节点属性的函数，属性不存在时返回空字符串
+        get_text: 读取节点文本的函数
+        find_img: 查找节点内第一个img元素的函数，不存在时返回None
+        
+    Returns:
+        List[Dict[str, str]]: 包含url和title字段的字典列表
+    """
+    # 按URL存储标题，字典既保持插入顺序又用于去重
+    links: Dict[str, str] = {}
+    
+    for a_tag in anchors:
+        href = get_attr(a_tag, "href").strip()
+        
+        # 跳过无效URL
+        if not href or href.startswith("#") or href.startswith("javascript:"):
+            continue
+        
+        # 处理相对URL，转换为绝对URL
+        absolute_url = urljoin(base_url, href)
+        
+        # 跳过重复URL
+        if absolute_url in links:
+            continue
+        
+        # 1. 尝试从a标签的文本内容提取标题
+        title = get_text(a_tag)
+        
+        # 2. 如果没有文本内容，尝试从title属性提取
+        if not title:
+            title = get_attr(a_tag, "title").strip()
+        
+        # 3. 如果没有title属性，尝试从包含的img标签的alt或title属性提取
+        if not title:
+            img_tag = find_img(a_tag)
+            if img_tag is not None:
+                title = get_attr(img_tag, "alt").strip()
+                if not title:
+                    title = get_attr(img_tag, "title").strip()
+        
+        # 4. 如果都没有，使用URL作为标题
+        if not title:
+            title = absolute_url
+        
+        # 添加到结果
+        links[absolute_url] = title
+    
+    return [{"url": url, "title": title} for url, title in links.items()]
+
 class WebParser:
     """
-    网页解析器，使用BeautifulSoup辅助HTML解析
+    网页解析器，使用lxml解析HTML并通过预编译的CSS选择器提取内容
     """
     
     def __init__(self):
@@ -24,99 +127,156 @@ class WebParser:
         Returns:
             (title, content_html): 标题和内容HTML
         """
-        # 创建BeautifulSoup对象
-        soup = BeautifulSoup(html_content, "html.parser")
+        return self.parse_from_tree(self.parse_tree(html_content), config)
+    
+    def parse_tree(self, html_content: str) -> lxml_html.HtmlElement:
+        """
+        将网页HTML解析为lxml文档树，便于在多个解析步骤间复用
+        
+        Args:
+            html_content: 网页HTML内容
+            
+        Returns:
+            lxml文档根元素
+        """
+        # 解析时丢弃注释节点，空文档按空页面处理
+        parser = lxml_html.HTMLParser(remove_comments=True)
+        try:
+            return lxml_html.document_fromstring(html_content, parser=parser)
+        except ValueError:
+            # 带XML编码声明的字符串不能直接解析，按UTF-8字节重新解析并忽略声明中的编码
+            parser = lxml_html.HTMLParser(remove_comments=True, encoding="utf-8")
+            return lxml_html.document_fromstring(html_content.encode("utf-8"), parser=parser)
+        except etree.ParserError:
+            return lxml_html.document_fromstring("<html><body></body></html>", parser=parser)
+    
+    def parse_from_tree(self, tree: lxml_html.HtmlElement, config: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        从已解析的lxml文档树中提取标题和内容
+        
+        注意：内容提取会就地修改传入的文档树，需要复用同一棵树的步骤应在此之前完成
+        
+        Args:
+            tree: lxml文档根元素
+            config: 解析配置，包含title_selector、content_selector、exclude_selectors等
+            
+        Returns:
+            (title, content_html): 标题和内容HTML
+        """
+        title, content_element = self.parse_element_from_tree(tree, config)
+        
+        # 返回处理后的HTML，不包含内容区域之后的文本
+        return title, lxml_html.tostring(content_element, encoding="unicode", with_tail=False)
+    
+    def parse_element_from_tree(self, tree: lxml_html.HtmlElement, config: Dict[str, Any]) -> Tuple[str, lxml_html.HtmlElement]:
+        """
+        从已解析的lxml文档树中提取标题和清理后的内容元素，内容元素可直接交给Markdown转换器，无需序列化
+        
+        注意：内容提取会就地修改传入的文档树，需要复用同一棵树的步骤应在此之前完成
+        
+        Args:
+            tree: lxml文档根元素
+            config: 解析配置，包含title_selector、content_selector、exclude_selectors等
+            
+        Returns:
+            (title, content_element): 标题和内容元素
+        """
+        # 未经ConfigManager加载的配置在此补充编译选择器
+        if "_title_sel" not in config:
+            config = compile_selectors(dict(config))
         
         # 获取标题
-        title = self._extract_title(soup, config)
+        title = self._extract_title(tree, config)
         
         # 获取内容
-        content_html = self._extract_content(soup, config)
+        content_element = self._extract_content(tree, config)
         
-        return title, content_html
+        return title, content_element
     
-    def _extract_title(self, soup: BeautifulSoup, config: Dict[str, Any]) -> str:
+    def _extract_title(self, tree: lxml_html.HtmlElement, config: Dict[str, Any]) -> str:
         """
         提取网页标题
         
         Args:
-            soup: BeautifulSoup对象
+            tree: lxml文档根元素
             config: 解析配置
             
         Returns:
             网页标题
         """
-        title_selector = config.get("title_selector", "title")
-        
         # 尝试使用CSS选择器提取标题
-        title_element = soup.select_one(title_selector)
-        if title_element:
-            return title_element.get_text(strip=True)
+        title_elements = config["_title_sel"](tree)
+        if title_elements:
+            return _get_text(title_elements[0])
         
         # 尝试从meta标签提取标题
-        meta_title = soup.select_one("meta[name='title']")
-        if meta_title and meta_title.get("content"):
-            return meta_title["content"].strip()
-        
-        # 尝试从og:title提取标题
-        og_title = soup.select_one("meta[property='og:title']")
-        if og_title and og_title.get("content"):
-            return og_title["content"].strip()
+        for selector in (_META_TITLE, _OG_TITLE):
+            meta_elements = selector(tree)
+            if meta_elements and meta_elements[0].get("content"):
+                return meta_elements[0].get("content").strip()
         
         # 默认返回空字符串
         return ""
     
-    def _extract_content(self, soup: BeautifulSoup, config: Dict[str, Any]) -> str:
+    def _extract_content(self, tree: lxml_html.HtmlElement, config: Dict[str, Any]) -> lxml_html.HtmlElement:
         """
         提取网页内容
         
         Args:
-            soup: BeautifulSoup对象
+            tree: lxml文档根元素
             config: 解析配置
             
         Returns:
-            内容HTML
+            清理后的内容元素
         """
-        content_selector = config.get("content_selector", "body")
-        exclude_selectors = config.get("exclude_selectors", ["script", "style", "nav", "footer"])
-        
-        # 复制原始soup，避免修改原对象
-        content_soup = BeautifulSoup(str(soup), "html.parser")
+        # 选择内容区域，直接在原文档树上处理，不再复制
+        content_elements = config["_content_sel"](tree)
+        if content_elements:
+            content_element = content_elements[0]
+        else:
+            content_element = tree.find("body")
+            if content_element is None:
+                content_element = tree
         
-        # 选择内容区域
-        content_element = content_soup.select_one(content_selector)
-        if not content_element:
-            content_element = content_soup.body or content_soup
-        
-        # 移除需要排除的元素
-        for selector in exclude_selectors:
-            for element in content_element.select(selector):
-                element.extract()
+        # 移除需要排除的元素，保留其后的文本；选择器结果包含元素自身，需跳过
+        for selector in config["_exclude_sels"]:
+            for element in selector(content_element):
+                if element is not content_element:
+                    element.drop_tree()
         
         # 清理内容，移除多余的空白和无用标签
         self._clean_content(content_element)
         
-        # 返回处理后的HTML
-        return str(content_element)
+        return content_element
     
-    def _clean_content(self, element: Tag) -> None:
+    def _clean_content(self, element: lxml_html.HtmlElement) -> None:
         """
         清理内容，移除多余的空白和无用标签
         
         Args:
-            element: 要清理的BeautifulSoup Tag对象
-        """
-        # 移除所有空标签
-        for tag in element.find_all():
-            if not tag.get_text(strip=True) and tag.name not in ["img", "br", "hr"]:
-                tag.extract()
-        
-        # 移除多余的空白
-        for text_node in element.find_all(text=True, recursive=True):
-            if text_node.strip():
-                text_node.replace_with(text_node.strip())
-            else:
-                text_node.extract()
+            element: 要清理的lxml元素
+        """
+        # 逆序遍历先序序列，子元素总是先于父元素处理，一次遍历同时完成空白清理和空标签判断
+        non_empty = set()
+        to_remove = []
+        for node in reversed(list(element.iter())):
+            # 移除多余的空白
+            if node.text is not None:
+                node.text = node.text.strip() or None
+            if node is not element and node.tail is not None:
+                node.tail = node.tail.strip() or None
+            
+            # 自身或任一子元素（含其后文本）有内容即为非空标签
+            if node.text or any(child in non_empty or child.tail for child in node):
+                non_empty.add(node)
+            elif node is not element and node.tag not in ["img", "br", "hr"]:
+                to_remove.append(node)
+        
+        # 移除所有空标签，父元素也会被移除时跳过其子元素
+        removed = set(to_remove)
+        for node in to_remove:
+            if node.getparent() not in removed:
+                node.drop_tree()
     
     def extract_links(self, html_content: str, base_url: str) -> List[Dict[str, str]]:
         """
@@ -129,67 +289,53 @@ class WebParser:
         Returns:
             List[Dict[str, str]]: 包含url和title字段的字典列表
         """
-        # 创建BeautifulSoup对象
-        soup = BeautifulSoup(html_content, "html.parser")
-        
-        # 存储结果的列表
-        links = []
-        # 用于去重的集合
-        seen_urls = set()
+        if LexborHTMLParser is not None:
+            return self._extract_links_lexbor(html_content, base_url)
+        return self.extract_links_from_tree(self.parse_tree(html_content), base_url)
+    
+    def _extract_links_lexbor(self, html_content: str, base_url: str) -> List[Dict[str, str]]:
+        """
+        使用selectolax(Lexbor)提取链接，无需构建完整的lxml文档树
         
-        # 遍历所有a标签
-        for a_tag in soup.find_all("a", href=True):
-            href = a_tag.get("href", "").strip()
-            
-            # 跳过无效URL
-            if not href or href.startswith("#") or href.startswith("javascript:"):
-                continue
-            
-            # 处理相对URL，转换为绝对URL
-            absolute_url = urljoin(base_url, href)
-            
-            # 跳过重复URL
-            if absolute_url in seen_urls:
-                continue
-            seen_urls.add(absolute_url)
-            
-            # 提取标题
-            title = ""
-            
-            # 1. 尝试从a标签的文本内容提取标题
-            text = a_tag.get_text(strip=True)
-            if text:
-                title = text
-            
-            # 2. 如果没有文本内容，尝试从title属性提取
-            if not title:
-                title_attr = a_tag.get("title", "").strip()
-                if title_attr:
-                    title = title_attr
-            
-            # 3. 如果没有title属性，尝试从包含的img标签的alt属性提取
-            if not title:
-                img_tag = a_tag.find("img")
-                if img_tag:
-                    alt_text = img_tag.get("alt", "").strip()
-                    if alt_text:
-                        title = alt_text
-                    # 或者从img标签的title属性提取
-                    img_title = img_tag.get("title", "").strip()
-                    if not title and img_title:
-                        title = img_title
-            
-            # 4. 如果都没有，使用URL作为标题
-            if not title:
-                title = absolute_url
+        Args:
+            html_content: 网页HTML内容
+            base_url: 基础URL，用于处理相对URL
             
-            # 添加到结果列表
-            links.append({
-                "url": absolute_url,
-                "title": title
-            })
+        Returns:
+            List[Dict[str, str]]: 包含url和title字段的字典列表
+        """
+        tree = LexborHTMLParser(html_content)
+        # 脚本和样式中的文本（如内联SVG图标里的<style>）不属于链接标题
+        tree.strip_tags(["script", "style"])
+        
+        # 遍历所有带href的a标签
+        return _collect_links(
+            tree.css("a[href]"),
+            base_url,
+            get_attr=lambda node, name: node.attributes.get(name) or "",
+            get_text=lambda node: node.text(strip=True),
+            find_img=lambda node: node.css_first("img")
+        )
+    
+    def extract_links_from_tree(self, tree: lxml_html.HtmlElement, base_url: str) -> List[Dict[str, str]]:
+        """
+        从已解析的lxml文档树中提取所有的a标签及其标题
         
-        return links
+        Args:
+            tree: lxml文档根元素
+            base_url: 基础URL，用于处理相对URL
+            
+        Returns:
+            List[Dict[str, str]]: 包含url和title字段的字典列表
+        """
+        # 遍历所有带href的a标签
+        return _collect_links(
+            _A_HREF(tree),
+            base_url,
+            get_attr=lambda node, name: node.get(name) or "",
+            get_text=_get_text,
+            find_img=lambda node: node.find(".//img")
+        )
 
 # 创建全局解析器实例
 web_parser = WebParser()
@@ -0,0 +1,33 @@
+from typing import Dict, Optional, Tuple, List
+
+from .config import config_manager
+from .parser import web_parser
+from .markdown import markdown_converter
+
+def parse_page(html_content: str, url: str, config_name: Optional[str] = None) -> Tuple[str, str, List[Dict[str, str]]]:
+    """
+    完整解析一个网页：提取链接、标题和内容并转换为Markdown
+    
+    供进程池调用：lxml文档树无法跨进程传递，因此解析树、配置查找和Markdown转换都在同一个工作进程内完成
+    
+    Args:
+        html_content: 网页HTML内容
+        url: 网页URL，用于匹配配置和处理相对URL
+        config_name: 解析配置名称，可选
+        
+    Returns:
+        (title, markdown_content, links): 标题、Markdown内容和链接列表
+    """
+    config = config_manager.get_config(config_name=config_name, url=url)
+    
+    # 只解析一次HTML，内容提取和链接提取共用同一棵树
+    tree = web_parser.parse_tree(html_content)
+    
+    # 内容提取会就地删除排除的元素，因此先提取链接
+    links = web_parser.extract_links_from_tree(tree, url)
+    title, content_element = web_parser.parse_element_from_tree(tree, config)
+    
+    # 直接从内容元素转换为Markdown，无需序列化后再次解析
+    markdown_content = markdown_converter.convert(content_element, title)
+    
+    return title, markdown_content, links
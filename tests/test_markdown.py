@@ -0,0 +1,84 @@
+import random
+
+import pytest
+from lxml import html as lxml_html
+
+from app.markdown import markdown_converter
+from app.parser import web_parser
+
+# 覆盖直接遍历lxml元素时自行实现的转换规则，以及回退到markdownify的表格和定义列表
+PARITY_CASES = [
+    "<ul><li>one</li><li>two<ul><li>nested <b>bold</b></li><li>deep<ol><li>x</li><li>y</li></ol></li></ul></li></ul>",
+    '<ol start="3"><li>third</li><li>fourth<ul><li>inner</li></ul></li></ol>',
+    "<ol><li><p>para item</p><p>second para</p></li><li>plain</li></ol>",
+    "<pre><code>def f():\n    return `x` + ``y``\n</code></pre>",
+    "<p>Use <code>a`b</code> and <code>``</code> inline</p>",
+    "<blockquote><p>quoted</p><blockquote>nested <em>quote</em></blockquote></blockquote>",
+    '<h1>Title with <a href="https://example.com/a">link</a></h1><h2><img src="/i.png" alt="Logo"> Logo</h2>',
+    '<h3><a href="/r" title="T">relative</a> and <img src=z title="t"></h3>',
+    "<p>line one<br>line two<br/>line three</p><hr><p>after rule</p>",
+    "<table><thead><tr><th>h1</th><th>h2</th></tr></thead><tbody><tr><td>a <b>b</b></td><td><a href=\"/c\">c</a></td></tr></tbody></table>",
+    "<dl><dt>term</dt><dd>definition with <i>style</i></dd><dt>other</dt><dd><ul><li>listed</li></ul></dd></dl>",
+    "<ul><li>outer<table><tr><td><ul><li>in cell</li></ul></td></tr></table></li></ul>",
+    "<div><p>2*3 = 6 and a_b</p><p>  spaced   text  </p><q>quote</q> <del>gone</del> <sup>up</sup></div>",
+    '<p><a href="https://example.com/u">https://example.com/u</a> autolink</p>',
+]
+
+def _assert_parity(body: str) -> None:
+    """
+    同一内容分别以lxml元素和序列化后的HTML字符串转换，结果应完全一致
+    """
+    tree = web_parser.parse_tree("<html><body><div id=c>%s</div></body></html>" % body)
+    el = tree.get_element_by_id("c")
+    expected = markdown_converter.convert(lxml_html.tostring(el, encoding="unicode", with_tail=False))
+    assert markdown_converter.convert(el) == expected
+
+@pytest.mark.parametrize("body", PARITY_CASES)
+def test_element_conversion_matches_markdownify(body):
+    """
+    元素转换与markdownify字符串转换的结果一致
+    """
+    _assert_parity(body)
+
+_TAGS = ["div", "p", "span", "b", "strong", "i", "em", "a", "code", "pre", "blockquote", "ul", "ol", "li",
+         "h1", "h2", "h3", "br", "img", "hr", "table", "section", "del", "sup", "q", "dl", "figcaption"]
+_TEXTS = [" ", "x", " y ", "\n", "a_b", "2*3", "  z  ", "`t`", "&lt;", " &amp; ", "http://u.v/w"]
+
+def _random_body(rng: random.Random, depth: int = 0) -> str:
+    """
+    随机生成结构合法的HTML片段
+    """
+    out = []
+    for _ in range(rng.randint(0, 4)):
+        if rng.random() >= 0.45 or depth >= 5:
+            out.append(rng.choice(_TEXTS))
+            continue
+        tag = rng.choice(_TAGS)
+        inner = _random_body(rng, depth + 1)
+        if tag in ("br", "hr"):
+            out.append("<%s>" % tag)
+        elif tag == "img":
+            out.append(rng.choice(['<img src="s.png" alt="A">', '<img src=z title="t">']))
+        elif tag == "a":
+            out.append(rng.choice(['<a href="http://u.v/w">', '<a href="/r" title="T">', "<a>"]) + inner + "</a>")
+        elif tag == "table":
+            out.append("<table><tr><th>h</th></tr><tr><td>%s</td></tr></table>" % inner)
+        elif tag == "dl":
+            out.append("<dl><dt>t</dt><dd>%s</dd></dl>" % inner)
+        elif tag == "li":
+            # lxml序列化空li时会省略结束标签，重新解析后结构不同，因此li总带有文本
+            out.append("<li>x%s</li>" % inner)
+        elif tag == "ol" and rng.random() < 0.3:
+            out.append('<ol start="3">%s</ol>' % inner)
+        else:
+            out.append("<%s>%s</%s>" % (tag, inner, tag))
+    return "".join(out)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_element_conversion_matches_markdownify_generated(seed):
+    """
+    使用固定种子随机生成的文档验证转换结果一致，每个种子生成多份文档
+    """
+    rng = random.Random(seed)
+    for _ in range(50):
+        _assert_parity(_random_body(rng))
@@ -0,0 +1,89 @@
+import pytest
+
+from app.parser import compile_selectors, web_parser
+
+BASE_URL = "https://example.com/"
+
+# 属性值中包含>、href=等容易让正则误判的写法
+TRICKY_LINKS = [
+    ('<a href="/p" x-on:click="() => go()">Go</a>', [{"url": "https://example.com/p", "title": "Go"}]),
+    ('<a href="/p" onclick="return a>b">Click</a>', [{"url": "https://example.com/p", "title": "Click"}]),
+    ('<a onclick="a>b" href="/p">Late href</a>', [{"url": "https://example.com/p", "title": "Late href"}]),
+    ('<a data-x="href=/wrong" href="/right">Right</a>', [{"url": "https://example.com/right", "title": "Right"}]),
+    ('<a title="x href=/wrong">No href</a>', []),
+    ("<a href='/q?a=1&amp;b=2' title='T'><img alt=\"a>b\" src=x></a>", [{"url": "https://example.com/q?a=1&b=2", "title": "T"}]),
+    ('<a href=/img><span data-x="<img alt=wrong>"></span><img src=x alt="Logo"></a>', [{"url": "https://example.com/img", "title": "Logo"}]),
+    ('<a href="/t"><b title="1>2">Bold</b> text</a>', [{"url": "https://example.com/t", "title": "Boldtext"}]),
+    ('<a HREF="/upper" href="/second">Upper</a>', [{"url": "https://example.com/upper", "title": "Upper"}]),
+]
+
+@pytest.mark.parametrize("markup, expected", TRICKY_LINKS)
+def test_extract_links_quoted_attributes(markup, expected):
+    """
+    引号内的特殊字符不应影响链接和标题的提取
+    """
+    html_content = "<html><body>%s</body></html>" % markup
+    assert web_parser.extract_links(html_content, BASE_URL) == expected
+
+@pytest.mark.parametrize("markup, expected", TRICKY_LINKS)
+def test_extract_links_from_tree_quoted_attributes(markup, expected):
+    """
+    基于lxml文档树的提取结果应与默认提取方式一致
+    """
+    html_content = "<html><body>%s</body></html>" % markup
+    assert web_parser.extract_links_from_tree(web_parser.parse_tree(html_content), BASE_URL) == expected
+
+def test_extract_links_skips_comments_and_scripts():
+    """
+    注释和脚本中的a标签不是真正的链接
+    """
+    html_content = (
+        '<html><body><!-- <a href="/c">c</a> -->'
+        '<script>var s = "<a href=\'/s\'>s</a>";</script>'
+        '<a href="/real">Real</a></body></html>'
+    )
+    assert web_parser.extract_links(html_content, BASE_URL) == [{"url": "https://example.com/real", "title": "Real"}]
+
+def test_extract_links_deduplicates_and_skips_invalid():
+    """
+    重复URL只保留第一个，锚点和javascript链接被跳过
+    """
+    html_content = (
+        '<html><body><a href="/x">First</a><a href="#top">Top</a>'
+        '<a href="javascript:void(0)">JS</a><a href="/x">Second</a><a href="/y"></a></body></html>'
+    )
+    assert web_parser.extract_links(html_content, BASE_URL) == [
+        {"url": "https://example.com/x", "title": "First"},
+        {"url": "https://example.com/y", "title": "https://example.com/y"},
+    ]
+
+# 链接内的脚本和样式文本不应出现在标题中
+SCRIPT_STYLE_LINKS = [
+    ('<a href="/home"><svg viewBox="0 0 8 8"><style>.a{fill:red}</style><path class="a" d="M0 0h8v8z"/></svg>Home</a>', [{"url": "https://example.com/home", "title": "Home"}]),
+    ('<a href="/s"><script>var x = 1;</script>Scripted</a>', [{"url": "https://example.com/s", "title": "Scripted"}]),
+    ('<a href="/i"><style>.i{}</style><img src=x alt="Icon"></a>', [{"url": "https://example.com/i", "title": "Icon"}]),
+]
+
+@pytest.mark.parametrize("markup, expected", SCRIPT_STYLE_LINKS)
+def test_extract_links_ignores_script_and_style_text(markup, expected):
+    """
+    内联SVG图标中的<style>和链接内的<script>不属于链接标题
+    """
+    html_content = "<html><body>%s</body></html>" % markup
+    assert web_parser.extract_links(html_content, BASE_URL) == expected
+
+@pytest.mark.parametrize("markup, expected", SCRIPT_STYLE_LINKS)
+def test_extract_links_from_tree_ignores_script_and_style_text(markup, expected):
+    """
+    基于lxml文档树提取时同样跳过脚本和样式文本
+    """
+    html_content = "<html><body>%s</body></html>" % markup
+    assert web_parser.extract_links_from_tree(web_parser.parse_tree(html_content), BASE_URL) == expected
+
+def test_parse_title_ignores_script_text():
+    """
+    标题元素内的脚本不属于页面标题
+    """
+    html_content = "<html><body><h1 class=t><script>var x=1</script>Real title</h1><p>Body</p></body></html>"
+    title, _ = web_parser.parse(html_content, compile_selectors({"title_selector": "h1.t", "content_selector": "body"}))
+    assert title == "Real title"